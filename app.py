@@ -1,13 +1,15 @@
 import os
+import time
 import random
 import requests
 from functools import wraps
 from datetime import date, timedelta, datetime
-from flask import Flask, render_template, redirect, url_for, request, flash, jsonify, abort, session
+from flask import Flask, render_template, redirect, url_for, request, flash, jsonify, abort, session, has_request_context
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_mail import Mail, Message
+from sqlalchemy import event, func, inspect, text
 from sqlalchemy.exc import IntegrityError
-from models import db, User, Question, UserProgress
+from models import db, User, Question, UserProgress, RoutingSession, REPLICA_BIND
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -29,13 +31,86 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('SQLALCHEMY_DATABASE_URI') or f'sqlite:///{os.path.join(BASE_DIR, "dsa.db")}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    "pool_pre_ping": True,
-    "pool_recycle": 300,
-}
+def engine_options(prefix):
+    """Pool options for one bind, e.g. DB_POOL_SIZE / REPLICA_POOL_SIZE from .env."""
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": 300,
+    }
+    for key in ('pool_size', 'max_overflow', 'pool_timeout'):
+        value = os.environ.get(f'{prefix}_{key.upper()}')
+        if value:
+            options[key] = int(value)
+    return options
+
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options('DB')
+
+# Optional read replica. GET pages marked with @replica_read query it; writes always hit the primary.
+# Without SQLALCHEMY_REPLICA_URI everything keeps using the primary engine.
+#
+# Local setup with two SQLite files standing in for primary + replica (.env):
+#   SQLALCHEMY_DATABASE_URI=sqlite:////tmp/primary.db
+#   SQLALCHEMY_REPLICA_URI=sqlite:////tmp/replica.db
+#   REPLICA_POOL_SIZE=5            # optional, also REPLICA_MAX_OVERFLOW / REPLICA_POOL_TIMEOUT
+#   DB_POOL_SIZE=10                # optional, same options for the primary
+#   REPLICA_STICKY_SECONDS=5       # how long a browser stays on the primary after it writes
+# `python app.py` (or create_tables()) creates the schema on new files; upgrade_schema() adds
+# newer columns to existing ones on both binds at startup. Nothing replicates
+# between them: app writes land only in primary.db, so copying rows into replica.db by hand
+# shows which bind a page read from and simulates replica lag.
+app.config['SQLALCHEMY_BINDS'] = {}
+if os.environ.get('SQLALCHEMY_REPLICA_URI'):
+    app.config['SQLALCHEMY_BINDS'][REPLICA_BIND] = {
+        'url': os.environ.get('SQLALCHEMY_REPLICA_URI'),
+        **engine_options('REPLICA'),
+    }
+# After a commit, keep this browser session on the primary for a few seconds so it reads its own writes
+app.config['REPLICA_STICKY_SECONDS'] = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
 
 db.init_app(app)
 
+def create_tables():
+    """Creates missing tables on the primary and, if configured, on the replica bind.
+    Models have no bind_key, so db.create_all() alone would leave a fresh replica empty."""
+    db.create_all()
+    if REPLICA_BIND in db.engines:
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+
+def upgrade_schema(engine):
+    """
+    Adds columns introduced after a database was first created (there is no migration tool,
+    db.create_all() never alters existing tables). Mirrors migrations/*.sql and is a no-op
+    once they are applied, so it is safe to run on every start.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table('user') or not inspector.has_table('user_progress'):
+        return # Fresh database, create_tables() builds the current schema
+
+    quote = engine.dialect.identifier_preparer.quote
+    user_columns = {c['name'] for c in inspector.get_columns('user')}
+    progress_columns = {c['name'] for c in inspector.get_columns('user_progress')}
+
+    # 001_add_progress_versions.sql
+    with engine.begin() as conn:
+        if 'progress_version' not in user_columns:
+            conn.execute(text(f'ALTER TABLE {quote("user")} ADD COLUMN progress_version INTEGER DEFAULT 0'))
+        if 'version' not in progress_columns:
+            conn.execute(text('ALTER TABLE user_progress ADD COLUMN version INTEGER DEFAULT 0'))
+            conn.execute(text('CREATE INDEX IF NOT EXISTS ix_user_progress_version ON user_progress (version)'))
+
+# Existing deployments pick up new columns before the first request instead of failing in load_user.
+# The replica is upgraded too, like create_tables(); a read-only streaming replica rejects the
+# ALTER (logged below) and gets the columns through replication instead.
+with app.app_context():
+    engines = {'primary': db.engine}
+    if REPLICA_BIND in db.engines:
+        engines[REPLICA_BIND] = db.engines[REPLICA_BIND]
+    for name, engine in engines.items():
+        try:
+            upgrade_schema(engine)
+        except Exception as e:
+            print(f"Schema Upgrade Error ({name}): {e}")
+
 # --- Security: Prevent Caching ---
 # This ensures that when you logout, the back button doesn't show sensitive pages
 # and different browsers don't show cached versions of the dashboard.
@@ -71,6 +146,25 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+def replica_read(f):
+    """Runs a read-only view against the replica bind, unless this browser just wrote something."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if session.get('primary_until', 0) > time.time():
+            return f(*args, **kwargs)
+        db.session.info['use_replica'] = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            db.session.info.pop('use_replica', None)
+    return decorated_function
+
+@event.listens_for(RoutingSession, 'after_commit')
+def pin_to_primary(db_session):
+    # Read-after-write: the replica may lag behind, so the next few page loads stay on the primary
+    if REPLICA_BIND in app.config['SQLALCHEMY_BINDS'] and has_request_context():
+        session['primary_until'] = time.time() + app.config['REPLICA_STICKY_SECONDS']
+
 # --- Routes ---
 
 @app.route('/')
@@ -176,6 +270,7 @@ def verify_otp():
 
 @app.route('/profile')
 @login_required
+@replica_read
 def profile():
     # Get all questions
     all_qs = Question.query.all()
@@ -288,6 +383,9 @@ def sync_user_from_leetcode(user):
             return {'status': 'success', 'marked_count': 0}
 
         all_qs = Question.query.all()
+        # Load the user's progress once: per-question queries would autoflush each new row
+        # (and bump progress_version) on every iteration
+        progress_map = {p.question_id: p for p in UserProgress.query.filter_by(user_id=user.id).all()}
         marked_count = 0
         
         for q in all_qs:
@@ -300,10 +398,11 @@ def sync_user_from_leetcode(user):
             
             if q_slug in solved_slugs:
                 # Mark as solved
-                prog = UserProgress.query.filter_by(user_id=user.id, question_id=q.id).first()
+                prog = progress_map.get(q.id)
                 if not prog:
                     prog = UserProgress(user_id=user.id, question_id=q.id, is_solved=True)
                     db.session.add(prog)
+                    progress_map[q.id] = prog
                     marked_count += 1
                 elif not prog.is_solved:
                     prog.is_solved = True
@@ -397,57 +496,74 @@ def update_streak(user):
     user.last_active_date = today
     # Note: We don't commit here, we let the caller handle commits to keep transaction atomic
 
-@app.route('/dashboard')
-@login_required
-def dashboard():
-    # Fetch all questions ordered by week
-    all_questions = Question.query.order_by(Question.week, Question.id).all()
-    
-    # Fetch user's progress
-    progress_records = UserProgress.query.filter_by(user_id=current_user.id).all()
+def get_progress_version(user_id):
+    """
+    The user's progress_version, read through db.session so it comes from the same bind
+    as the progress data it describes. Read it *before* that data: rows committed in
+    between are then just sent again by the next delta instead of being skipped.
+    """
+    return db.session.query(User.progress_version).filter_by(id=user_id).scalar() or 0
+
+def get_week_stats(user_id, week_num):
+    """Completed/total/percent for one week of a user's progress."""
+    total_week = Question.query.filter_by(week=week_num).count()
     
-    # Create lookup dictionaries for fast access in template
-    solved_map = {p.question_id: p.is_solved for p in progress_records}
-    bookmark_map = {p.question_id: p.is_bookmarked for p in progress_records}
+    # Count user solved for this week
+    completed_week = db.session.query(UserProgress).join(Question).filter(
+        UserProgress.user_id == user_id,
+        UserProgress.is_solved == True,
+        Question.week == week_num
+    ).count()
     
-    # Calculate XP (100 XP per solved problem)
-    solved_count = sum(1 for p in progress_records if p.is_solved)
-    # user_xp = solved_count * 100  <-- Handled by context_processor now
+    percent = int((completed_week / total_week) * 100) if total_week > 0 else 0
     
-    # Organize by week for the accordion view
-    weeks_data = {}
+    return {
+        'week': week_num,
+        'completed': completed_week,
+        'total': total_week,
+        'percent': percent
+    }
+
+@app.route('/dashboard')
+@login_required
+@replica_read
+def dashboard():
+    # Only the per-week summary bars are rendered here; the question tables are
+    # fetched from /api/week/<n> when an accordion is opened.
+    progress_version = get_progress_version(current_user.id)
+
     weeks_stats = {} # To store progress per week
-    
     for i in range(1, 15):
-        weeks_data[i] = []
         weeks_stats[i] = {'total': 0, 'completed': 0, 'percent': 0}
-        
-    for q in all_questions:
-        if q.week in weeks_data:
-            is_solved = solved_map.get(q.id, False)
-            weeks_data[q.week].append({
-                'q': q,
-                'solved': is_solved,
-                'bookmarked': bookmark_map.get(q.id, False)
-            })
-            
-            # Update stats
-            weeks_stats[q.week]['total'] += 1
-            if is_solved:
-                weeks_stats[q.week]['completed'] += 1
-                
+
+    totals = db.session.query(Question.week, func.count(Question.id)).group_by(Question.week).all()
+    for week_num, total in totals:
+        if week_num in weeks_stats:
+            weeks_stats[week_num]['total'] = total
+
+    completed = db.session.query(Question.week, func.count(UserProgress.id)).join(
+        UserProgress, UserProgress.question_id == Question.id
+    ).filter(
+        UserProgress.user_id == current_user.id,
+        UserProgress.is_solved == True
+    ).group_by(Question.week).all()
+    for week_num, done in completed:
+        if week_num in weeks_stats:
+            weeks_stats[week_num]['completed'] = done
+
     # Calculate percentages
     for w in weeks_stats:
         if weeks_stats[w]['total'] > 0:
             weeks_stats[w]['percent'] = int((weeks_stats[w]['completed'] / weeks_stats[w]['total']) * 100)
 
     return render_template('dashboard.html', 
-                         weeks=weeks_data, 
                          weeks_stats=weeks_stats,
+                         progress_version=progress_version,
                          username=current_user.username)
 
 @app.route('/revision')
 @login_required
+@replica_read
 def revision():
     # Fetch user's bookmarked progress
     bookmarks = UserProgress.query.filter_by(user_id=current_user.id, is_bookmarked=True).all()
@@ -478,6 +594,60 @@ def revision():
 
 # --- API Endpoints (AJAX) ---
 
+@app.route('/api/week/<int:week_num>', methods=['GET'])
+@login_required
+@replica_read
+def week_questions(week_num):
+    """Questions of one week with the user's solved/bookmarked state (lazy dashboard accordion)."""
+    if week_num < 1 or week_num > 14:
+        return jsonify({'error': 'Week not found'}), 404
+
+    # The page already knows about min_version; if the replica hasn't caught up to it yet,
+    # answer from the primary so the client never renders rows older than what it has seen.
+    min_version = request.args.get('min_version', 0, type=int)
+    version = get_progress_version(current_user.id)
+    if version < min_version and db.session.info.pop('use_replica', None):
+        version = get_progress_version(current_user.id)
+
+    questions = Question.query.filter_by(week=week_num).order_by(Question.id).all()
+
+    question_ids = [q.id for q in questions]
+    if question_ids:
+        progress_records = UserProgress.query.filter(
+            UserProgress.user_id == current_user.id,
+            UserProgress.question_id.in_(question_ids)
+        ).all()
+    else:
+        progress_records = []
+    progress_map = {p.question_id: p for p in progress_records}
+
+    items = []
+    completed = 0
+    for q in questions:
+        prog = progress_map.get(q.id)
+        is_solved = bool(prog and prog.is_solved)
+        if is_solved:
+            completed += 1
+        items.append({
+            'id': q.id,
+            'name': q.problem_name,
+            'link': q.problem_link,
+            'topic': q.topic,
+            'difficulty': q.difficulty,
+            'solved': is_solved,
+            'bookmarked': bool(prog and prog.is_bookmarked)
+        })
+
+    total = len(questions)
+    return jsonify({
+        'week': week_num,
+        'version': version,
+        'completed': completed,
+        'total': total,
+        'percent': int((completed / total) * 100) if total > 0 else 0,
+        'questions': items
+    })
+
 @app.route('/api/toggle', methods=['POST'])
 @login_required
 def toggle_status():
@@ -525,24 +695,7 @@ def toggle_status():
     if field == 'solved':
         question = db.session.get(Question, q_id)
         if question:
-            week_num = question.week
-            total_week = Question.query.filter_by(week=week_num).count()
-            
-            # Count user solved for this week
-            completed_week = db.session.query(UserProgress).join(Question).filter(
-                UserProgress.user_id == current_user.id,
-                UserProgress.is_solved == True,
-                Question.week == week_num
-            ).count()
-            
-            percent = int((completed_week / total_week) * 100) if total_week > 0 else 0
-            
-            week_data = {
-                'week': week_num,
-                'completed': completed_week,
-                'total': total_week,
-                'percent': percent
-            }
+            week_data = get_week_stats(current_user.id, question.week)
 
     return jsonify({
         'success': True, 
@@ -552,8 +705,48 @@ def toggle_status():
         'week_data': week_data
     })
 
+@app.route('/api/progress/delta', methods=['GET'])
+@login_required
+@replica_read
+def progress_delta():
+    """
+    Progress rows changed since the client's last known version, plus refreshed counters.
+    Lets other tabs/devices (and the LeetCode sync) show up without reloading the page.
+    """
+    since = request.args.get('since', 0, type=int)
+
+    version = get_progress_version(current_user.id)
+    if since >= version:
+        return jsonify({'version': version, 'changes': []})
+
+    rows = db.session.query(UserProgress, Question.week).join(Question).filter(
+        UserProgress.user_id == current_user.id,
+        UserProgress.version > since
+    ).all()
+
+    changes = []
+    for prog, week_num in rows:
+        changes.append({
+            'question_id': prog.question_id,
+            'week': week_num,
+            'solved': bool(prog.is_solved),
+            'bookmarked': bool(prog.is_bookmarked)
+        })
+
+    solved_count_all = UserProgress.query.filter_by(user_id=current_user.id, is_solved=True).count()
+    weeks = sorted({c['week'] for c in changes if c['week'] is not None})
+
+    return jsonify({
+        'version': version,
+        'changes': changes,
+        'new_xp': solved_count_all * 100,
+        'new_streak': current_user.streak_count,
+        'weeks': [get_week_stats(current_user.id, w) for w in weeks]
+    })
+
 @app.route('/api/random', methods=['GET'])
 @login_required
+@replica_read
 def random_question():
     mode = request.args.get('mode', 'any') # 'any' or 'unsolved'
     
@@ -591,6 +784,7 @@ def random_question():
 @app.route('/admin')
 @login_required
 @admin_required
+@replica_read
 def admin_dashboard():
     stats = {
         'user_count': User.query.count(),
@@ -645,5 +839,5 @@ def admin_delete_user(user_id):
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all() # Creates tables if they don't exist
+        create_tables() # Creates tables if they don't exist (primary + replica)
     app.run(debug=True)
\ No newline at end of file
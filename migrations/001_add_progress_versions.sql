@@ -0,0 +1,6 @@
+-- Delta progress sync (/api/progress/delta) needs a per-user progress version and a
+-- per-row version. app.py applies this automatically on startup (upgrade_schema()); run it
+-- by hand only if the app's database user isn't allowed to ALTER tables.
+ALTER TABLE "user" ADD COLUMN progress_version INTEGER DEFAULT 0;
+ALTER TABLE user_progress ADD COLUMN version INTEGER DEFAULT 0;
+CREATE INDEX IF NOT EXISTS ix_user_progress_version ON user_progress (version);
@@ -1,8 +1,25 @@
+from sqlalchemy import event, update
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 
-db = SQLAlchemy()
+# Bind key of the optional read replica (see SQLALCHEMY_BINDS in app.py)
+REPLICA_BIND = 'replica'
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the replica bind when the current request asked for it
+    (session.info['use_replica']). Flushes and anything without the flag go to the primary.
+    """
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('use_replica') and not self._flushing:
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # 1. User Table
 class User(UserMixin, db.Model):
@@ -21,6 +38,9 @@ class User(UserMixin, db.Model):
     last_leetcode_sync = db.Column(db.DateTime, nullable=True)
     streak_count = db.Column(db.Integer, default=0)
     
+    # Bumped on every UserProgress change, lets clients fetch only what changed (/api/progress/delta)
+    progress_version = db.Column(db.Integer, default=0)
+    
     # Relationship to track progress
     progress = db.relationship('UserProgress', backref='user', lazy=True)
 
@@ -52,4 +72,27 @@ class UserProgress(db.Model):
     question_id = db.Column(db.Integer, db.ForeignKey('dsa_questions.id'), nullable=False)
     
     is_solved = db.Column(db.Boolean, default=False)
-    is_bookmarked = db.Column(db.Boolean, default=False)
\ No newline at end of file
+    is_bookmarked = db.Column(db.Boolean, default=False)
+    
+    # Value of user.progress_version when this row last changed
+    version = db.Column(db.Integer, default=0, index=True)
+
+@event.listens_for(RoutingSession, 'before_flush')
+def bump_progress_version(session, flush_context, instances):
+    changed = [obj for obj in session.new if isinstance(obj, UserProgress)]
+    changed += [obj for obj in session.dirty if isinstance(obj, UserProgress) and session.is_modified(obj)]
+    if not changed:
+        return
+
+    # One atomic increment per user per flush; the row lock keeps versions in commit order
+    versions = {}
+    for user_id in {p.user_id for p in changed}:
+        versions[user_id] = session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(progress_version=db.func.coalesce(User.progress_version, 0) + 1)
+            .returning(User.progress_version)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+    for p in changed:
+        p.version = versions[p.user_id]
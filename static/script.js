@@ -42,35 +42,7 @@ async function toggleStatus(questionId, field, btnElement = null, weekNum = null
                     if (completed < 0) completed = 0;
                     if (completed > total) completed = total;
                     
-                    textEl.innerText = `${completed}/${total}`;
-                    
-                    const percent = total > 0 ? (completed / total) * 100 : 0;
-                    barEl.style.width = `${percent}%`;
-
-                    // 3. Instant System Integrity Update (Sidebar)
-                    const integrityTextEl = document.getElementById(`integrity-text-${weekNum}`);
-                    const integrityBarEl = document.getElementById(`integrity-bar-${weekNum}`);
-                    
-                    if (integrityTextEl && integrityBarEl) {
-                        const intPercent = Math.floor(percent);
-                        integrityTextEl.innerText = `${intPercent}%`;
-                        integrityBarEl.style.width = `${percent}%`;
-                        
-                        // Update colors for 100%
-                        if (intPercent === 100) {
-                            integrityTextEl.classList.remove('text-neon-blue');
-                            integrityTextEl.classList.add('text-neon-green');
-                            
-                            integrityBarEl.classList.remove('bg-neon-blue', 'shadow-neon-blue');
-                            integrityBarEl.classList.add('bg-neon-green', 'shadow-neon-green');
-                        } else {
-                            integrityTextEl.classList.add('text-neon-blue');
-                            integrityTextEl.classList.remove('text-neon-green');
-                            
-                            integrityBarEl.classList.add('bg-neon-blue', 'shadow-neon-blue');
-                            integrityBarEl.classList.remove('bg-neon-green', 'shadow-neon-green');
-                        }
-                    }
+                    renderWeekProgress(weekNum, completed, total);
                 }
             }
         } 
@@ -80,15 +52,7 @@ async function toggleStatus(questionId, field, btnElement = null, weekNum = null
             const isCurrentlyBookmarked = starSpan.innerText.trim() === '★';
             isAdding = !isCurrentlyBookmarked; // If it was star, we are removing
             
-            starSpan.innerText = isAdding ? '★' : '☆';
-            
-            if (isAdding) {
-                btnElement.classList.remove('text-gray-400', 'hover:text-yellow-300');
-                btnElement.classList.add('text-yellow-400', 'drop-shadow-[0_0_10px_rgba(250,204,21,0.6)]');
-            } else {
-                btnElement.classList.remove('text-yellow-400', 'drop-shadow-[0_0_10px_rgba(250,204,21,0.6)]');
-                btnElement.classList.add('text-gray-400', 'hover:text-yellow-300');
-            }
+            renderBookmark(btnElement, isAdding);
         }
         // --- OPTIMISTIC UI UPDATE END ---
 
@@ -105,6 +69,9 @@ async function toggleStatus(questionId, field, btnElement = null, weekNum = null
             })
         });
         const data = await response.json();
+
+        // Nudge other open tabs to pull the change (see syncProgress)
+        localStorage.setItem('progressChangedAt', Date.now());
         
         // Use server data to correct if somehow drift happened, or just trust the optimistic update
         // We can optionally reconcile here if needed, but usually not needed for simple counters
@@ -137,6 +104,56 @@ async function toggleStatus(questionId, field, btnElement = null, weekNum = null
     }
 }
 
+// Week header bar + "System Integrity" sidebar for one week
+function renderWeekProgress(weekNum, completed, total) {
+    const textEl = document.getElementById(`progress-text-${weekNum}`);
+    const barEl = document.getElementById(`progress-bar-${weekNum}`);
+    if (!textEl || !barEl) return;
+
+    textEl.innerText = `${completed}/${total}`;
+    
+    const percent = total > 0 ? (completed / total) * 100 : 0;
+    barEl.style.width = `${percent}%`;
+
+    const integrityTextEl = document.getElementById(`integrity-text-${weekNum}`);
+    const integrityBarEl = document.getElementById(`integrity-bar-${weekNum}`);
+    
+    if (integrityTextEl && integrityBarEl) {
+        const intPercent = Math.floor(percent);
+        integrityTextEl.innerText = `${intPercent}%`;
+        integrityBarEl.style.width = `${percent}%`;
+        
+        // Update colors for 100%
+        if (intPercent === 100) {
+            integrityTextEl.classList.remove('text-neon-blue');
+            integrityTextEl.classList.add('text-neon-green');
+            
+            integrityBarEl.classList.remove('bg-neon-blue', 'shadow-neon-blue');
+            integrityBarEl.classList.add('bg-neon-green', 'shadow-neon-green');
+        } else {
+            integrityTextEl.classList.add('text-neon-blue');
+            integrityTextEl.classList.remove('text-neon-green');
+            
+            integrityBarEl.classList.add('bg-neon-blue', 'shadow-neon-blue');
+            integrityBarEl.classList.remove('bg-neon-green', 'shadow-neon-green');
+        }
+    }
+}
+
+// Star text + glow for a bookmark button
+function renderBookmark(btnElement, isBookmarked) {
+    const starSpan = btnElement.querySelector('span') || btnElement;
+    starSpan.innerText = isBookmarked ? '★' : '☆';
+    
+    if (isBookmarked) {
+        btnElement.classList.remove('text-gray-400', 'hover:text-yellow-300');
+        btnElement.classList.add('text-yellow-400', 'drop-shadow-[0_0_10px_rgba(250,204,21,0.6)]');
+    } else {
+        btnElement.classList.remove('text-yellow-400', 'drop-shadow-[0_0_10px_rgba(250,204,21,0.6)]');
+        btnElement.classList.add('text-gray-400', 'hover:text-yellow-300');
+    }
+}
+
 let currentMode = 'any';
 
 // Function to Pick Random Question (In-View)
@@ -210,4 +227,149 @@ async function pickRandom(mode) {
 function closeRandomView() {
     document.getElementById('random-view').classList.add('hidden');
     document.getElementById('schedule-view').classList.remove('hidden');
-}
\ No newline at end of file
+}
+
+// --- Lazy Week Loading (Dashboard Accordion) ---
+// Each week's table is fetched from /api/week/<n> the first time it's needed.
+const weekRequests = {};
+
+// Same escaping Jinja autoescape did for the server-rendered rows (safe inside attributes too)
+function escapeHtml(value) {
+    return String(value ?? '')
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
+// Only http(s) problem links are rendered; anything else (e.g. javascript:) becomes '#'
+function safeLink(value) {
+    try {
+        const url = new URL(value, window.location.origin);
+        if (url.protocol === 'http:' || url.protocol === 'https:') return url.href;
+    } catch (e) {
+        // Malformed URL
+    }
+    return '#';
+}
+
+function difficultyClasses(difficulty) {
+    if (difficulty && difficulty.includes('Easy')) return 'bg-green-500 text-green-400 border-green-500/30';
+    if (difficulty && difficulty.includes('Medium')) return 'bg-yellow-500 text-yellow-400 border-yellow-500/30';
+    return 'bg-red-500 text-red-400 border-red-500/30';
+}
+
+function renderWeekRows(weekNum, questions) {
+    const tbody = document.getElementById(`week-rows-${weekNum}`);
+    if (!tbody) return;
+
+    if (questions.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="5" class="p-4 text-center text-gray-500 text-xs">NO_PROBLEMS_IN_MODULE</td></tr>';
+        return;
+    }
+
+    tbody.innerHTML = questions.map(q => `
+        <tr class="hover:bg-white/5 transition-colors group/row">
+            <td class="p-4 text-center">
+                <input type="checkbox" id="solved-${q.id}"
+                       class="w-4 h-4 rounded border-gray-600 bg-gray-900 accent-neon-green cursor-pointer" 
+                       onchange="toggleStatus(${q.id}, 'solved', this, ${weekNum})"
+                       ${q.solved ? 'checked' : ''}>
+            </td>
+            <td class="p-4">
+                <a href="${escapeHtml(safeLink(q.link))}" target="_blank" class="text-indigo-300 hover:text-neon-blue hover:shadow-[0_0_10px_rgba(0,243,255,0.4)] transition-all">
+                    ${escapeHtml(q.name)}
+                </a>
+            </td>
+            <td class="p-4">
+                <span class="text-xs text-gray-400 font-mono">${escapeHtml(q.topic)}</span>
+            </td>
+            <td class="p-4">
+                <span class="text-xs px-2 py-1 rounded bg-opacity-20 border ${difficultyClasses(q.difficulty)}">
+                    ${escapeHtml(q.difficulty)}
+                </span>
+            </td>
+            <td class="p-4 text-center">
+                <button id="bookmark-${q.id}" onclick="toggleStatus(${q.id}, 'bookmarked', this)" class="group focus:outline-none transition-all duration-300 transform hover:scale-125 p-2 rounded-full hover:bg-white/5 ${q.bookmarked ? 'text-yellow-400 drop-shadow-[0_0_10px_rgba(250,204,21,0.6)]' : 'text-gray-400 hover:text-yellow-300'}">
+                    <span class="text-3xl bookmark-icon-${q.id} block">${q.bookmarked ? '★' : '☆'}</span>
+                </button>
+            </td>
+        </tr>
+    `).join('');
+}
+
+function loadWeek(weekNum) {
+    // Reuse the in-flight/finished request so prefetch + open never fetch twice
+    if (weekRequests[weekNum]) return weekRequests[weekNum];
+
+    // min_version makes the server skip a replica that is behind what this page has already seen
+    const minVersion = window.progressVersion ?? 0;
+    weekRequests[weekNum] = fetch(`/api/week/${weekNum}?min_version=${minVersion}`)
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.json();
+        })
+        .then(data => {
+            // A delta moved the page past this snapshot while it was in flight: don't render older rows
+            if (window.progressVersion !== undefined && data.version < window.progressVersion) {
+                delete weekRequests[weekNum];
+                return loadWeek(weekNum);
+            }
+            renderWeekRows(weekNum, data.questions);
+            // Header bar from the same snapshot as the rows (it may be newer than the page render)
+            renderWeekProgress(weekNum, data.completed, data.total);
+            return data;
+        })
+        .catch(error => {
+            console.error(`Error loading week ${weekNum}:`, error);
+            delete weekRequests[weekNum]; // Allow a retry on next open
+            const tbody = document.getElementById(`week-rows-${weekNum}`);
+            if (tbody) {
+                tbody.innerHTML = '<tr><td colspan="5" class="p-4 text-center text-red-400 text-xs">LOAD_FAILED // REOPEN_TO_RETRY</td></tr>';
+            }
+        });
+
+    return weekRequests[weekNum];
+}
+
+
+// --- Delta Progress Sync (Multi-Tab / Multi-Device) ---
+// window.progressVersion is set by base.html on the dashboard; only rows changed since then are fetched.
+let progressSyncInFlight = false;
+
+function applyProgressDelta(data) {
+    data.changes.forEach(change => {
+        // Rows only exist for weeks that have been opened; unopened weeks fetch fresh data later
+        const checkbox = document.getElementById(`solved-${change.question_id}`);
+        if (checkbox) checkbox.checked = change.solved;
+
+        const bookmarkBtn = document.getElementById(`bookmark-${change.question_id}`);
+        if (bookmarkBtn) renderBookmark(bookmarkBtn, change.bookmarked);
+    });
+
+    (data.weeks || []).forEach(w => renderWeekProgress(w.week, w.completed, w.total));
+
+    const xpEl = document.getElementById('user-xp');
+    if (xpEl && data.new_xp !== undefined) xpEl.innerText = `${data.new_xp} XP`;
+
+    const streakEl = document.getElementById('user-streak');
+    if (streakEl && data.new_streak !== undefined && data.new_streak !== null) streakEl.innerText = data.new_streak;
+}
+
+async function syncProgress() {
+    if (progressSyncInFlight || window.progressVersion === undefined) return;
+    progressSyncInFlight = true;
+    try {
+        const response = await fetch(`/api/progress/delta?since=${window.progressVersion}`);
+        const data = await response.json();
+        if (data.version > window.progressVersion) {
+            applyProgressDelta(data);
+            window.progressVersion = data.version;
+        }
+    } catch (error) {
+        console.error('[DeltaSync] Error:', error);
+    } finally {
+        progressSyncInFlight = false;
+    }
+}